@@ -1,7 +1,6 @@
 from fastapi import APIRouter, UploadFile, File, Depends, HTTPException
 from fastapi.responses import FileResponse
 from pathlib import Path
-from app.core.dependencies import get_current_user
 from app.services.oss import upload_file_to_oss
 import pymysql
 from datetime import datetime
@@ -33,12 +32,12 @@ def admin_only(
     summary="上传模板",
     description="上传模板文件并存储元数据"
 )
-async def upload_template(
+def upload_template(
     file: UploadFile = File(...),
     user=Depends(admin_only),
     db: pymysql.connections.Connection = Depends(get_db)
 ):
-    content = await file.read()
+    content = file.file.read()
     key = upload_file_to_oss(file.filename, content)
     template_id = f"tpl_{uuid.uuid4().hex[:8]}"  
     
@@ -86,13 +85,13 @@ async def upload_template(
     summary="更新模板",
     description="重新上传模板并更新元数据"
 )
-async def update_template(
+def update_template(
     template_id: str,
     file: UploadFile = File(...),
     user=Depends(admin_only),
     db: pymysql.connections.Connection = Depends(get_db)
 ):
-    content = await file.read()
+    content = file.file.read()
     if not content:
         raise HTTPException(status_code=400, detail="上传文件为空")
     key = upload_file_to_oss(file.filename, content)
@@ -1,6 +1,6 @@
-from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException
 from app.core.dependencies import get_current_user
-from app.services.ai_adapter import submit_ai_review
+from app.services.ai_batcher import ai_batcher
 
 router = APIRouter()
 
@@ -10,12 +10,12 @@ router = APIRouter()
     summary="触发 AI 评审",
     description="提交评审任务到后台队列"
 )
-def trigger_ai_review(paper_id: int, background_tasks: BackgroundTasks, current_user=Depends(get_current_user)):
+async def trigger_ai_review(paper_id: int, current_user=Depends(get_current_user)):
     # 权限检查由业务层负责（是否为论文作者或指导教师）
-    # 这里将任务交给后台/任务队列
+    # 这里将任务放入批处理队列，短时间内的多个请求合并为一次 AI 调用
     try:
-        background_tasks.add_task(submit_ai_review, paper_id, current_user)
-    except Exception as e:
+        ai_batcher.enqueue(paper_id, current_user)
+    except RuntimeError:
         raise HTTPException(status_code=503, detail="AI 服务暂时不可用")
     return {"status": "排队中", "message": "任务已加入队列"}
 
@@ -1,12 +1,10 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
-from app.core.dependencies import get_current_user
-from app.schemas.annotation import AnnotationCreate, AnnotationOut
 import pymysql
-import json
+import orjson
 from app.database import get_db
 from loguru import logger
 from datetime import datetime
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, List
 import urllib.parse
 import re 
 from pydantic import BaseModel
@@ -35,7 +33,7 @@ def _parse_current_user(current_user: Optional[str]) -> dict:
             return {"sub": 0, "username": "", "roles": []}
         if raw.isdigit():
             return {"sub": int(raw), "username": f"user{raw}", "roles": ["student"]}
-        data = json.loads(raw)
+        data = orjson.loads(raw)
         if isinstance(data, dict):
             return data
     except Exception:
@@ -47,7 +45,7 @@ def _parse_coordinates(coord_str: Optional[str]) -> Optional[Dict[str, float]]:
     if not coord_str:
         return None
     try:
-        return json.loads(coord_str)
+        return orjson.loads(coord_str)
     except Exception:
         logger.warning(f"解析坐标失败: {coord_str}")
         return None
@@ -118,7 +116,7 @@ def create_annotation(
             x = float(match.group(1))
             y = float(match.group(3))
             coord_data = {"x": x, "y": y}
-            coord_json = json.dumps(coord_data)
+            coord_json = orjson.dumps(coord_data).decode()
         except ValueError as e:
             raise HTTPException(status_code=400, detail=f"坐标格式不合法: {str(e)}")
         except Exception as e:
@@ -258,7 +256,7 @@ def update_annotation(
             x = float(match.group(1))
             y = float(match.group(3))
             coord_data = {"x": x, "y": y}
-            coord_json = json.dumps(coord_data)
+            coord_json = orjson.dumps(coord_data).decode()
         except ValueError as e:
             raise HTTPException(status_code=400, detail=f"坐标格式不合法: {str(e)}")
         except Exception as e:
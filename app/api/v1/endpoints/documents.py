@@ -4,7 +4,7 @@ import pymysql
 from app.database import get_db
 from app.schemas.document import MaterialResponse
 from app.services.oss import upload_attachment_to_storage
-import json
+import orjson
 from datetime import datetime
 from typing import Optional
 
@@ -20,7 +20,7 @@ def _parse_current_user(current_user: Optional[str]) -> dict:
             return {"sub": 0, "username": "", "roles": []}
         if raw.isdigit():
             return {"sub": int(raw), "username": f"user{raw}", "roles": ["student"]}
-        data = json.loads(raw)
+        data = orjson.loads(raw)
         if isinstance(data, dict):
             sub_value = data.get("sub", 0)
             if isinstance(sub_value, str) and sub_value.isdigit():
@@ -41,7 +41,7 @@ def _parse_current_user(current_user: Optional[str]) -> dict:
     summary="上传材料",
     description="上传材料并存储到数据库"
 )
-async def upload_material(
+def upload_material(
     file: UploadFile = File(...),  
     name: str = Query(..., description="username"),
     file_type: str = Query(
@@ -50,7 +50,7 @@ async def upload_material(
         enum=["document", "essay"] 
     ),
     version: int = Query(1, description="版本号，默认1，最小值1", ge=1),
-    remark: str = Query(None, description="备注信息"),
+    remark: str = Query(None, description="备注信息", max_length=512),
     db: pymysql.connections.Connection = Depends(get_db),
     current_user: Optional[str] = Query(None, description="提交者信息(JSON字符串，包含 sub/username/roles)"),
 ):
@@ -72,7 +72,7 @@ async def upload_material(
         )
     # 读取文件内容
     try:
-        content = await file.read()
+        content = file.file.read()
         if not content:
             raise HTTPException(status_code=400, detail="上传的文件内容不能为空")
     except Exception as e:
@@ -142,13 +142,13 @@ async def upload_material(
     summary="更新材料",
     description="替换已有材料文件并更新记录"
 )
-async def update_material(
+def update_material(
     material_id: int,
     file: UploadFile = File(...),
     name: str = Query(..., description="username"),
     file_type: str = Query(None, description="文件类型：document(文档)或essay(文章)", enum=["document", "essay"]),
     version: int = Query(None, description="版本号", ge=1),
-    remark: str = Query(None, description="备注"),
+    remark: str = Query(None, description="备注", max_length=512),
     db: pymysql.connections.Connection = Depends(get_db),
     current_user: Optional[str] = Query(None, description="提交者信息(JSON字符串，包含 sub/username/roles)"),
 ):
@@ -171,7 +171,7 @@ async def update_material(
         )
     # 读取文件内容
     try:
-        content = await file.read()
+        content = file.file.read()
         if not content:
             raise HTTPException(status_code=400, detail="上传的文件内容不能为空")
     except Exception as e:
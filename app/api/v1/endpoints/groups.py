@@ -1,7 +1,7 @@
 from fastapi import APIRouter, UploadFile, File,  HTTPException, Query, Header
 from typing import Optional, List
-from pydantic import BaseModel  
-import json
+from pydantic import BaseModel, Field
+import orjson
 import pymysql
 from datetime import datetime  
 from loguru import logger  
@@ -38,7 +38,7 @@ class GroupMember(BaseModel):
 class GroupUpdate(BaseModel):
     group_name: str | None = None
     teacher_id: str | None = None
-    description: str | None = None
+    description: str | None = Field(None, max_length=512)
 
 
 
@@ -53,7 +53,7 @@ def _parse_current_user(current_user: Optional[dict|str]) -> dict:
             import urllib.parse
             cu = urllib.parse.unquote(current_user)
             if cu.strip():
-                current_user = json.loads(cu)
+                current_user = orjson.loads(cu)
             else:
                 current_user = None
         if not isinstance(current_user, dict):
@@ -302,7 +302,7 @@ def list_groups(
     summary="导入群组与师生关系",
     description="上传 TSV/CSV 文件批量导入群组及师生关系"
 )
-async def import_groups(
+def import_groups(
     file: UploadFile = File(...),
     current_user: Optional[str] = Query(None),
 ):
@@ -314,12 +314,12 @@ async def import_groups(
             current_user = urllib.parse.unquote(current_user)
             if current_user.strip():
                 # 解析为字典
-                current_user = json.loads(current_user)
+                current_user = orjson.loads(current_user)
             else:
                 current_user = None
         if not isinstance(current_user, dict):
             current_user = {"sub": 0, "username": "", "roles": []}
-    except (json.JSONDecodeError, Exception) as e:
+    except (orjson.JSONDecodeError, Exception) as e:
         logger.error(f"解析current_user失败: {str(e)}")
         current_user = {"sub": 0, "username": "", "roles": []}
 
@@ -347,7 +347,7 @@ async def import_groups(
             status_code=400,
             detail=f"请上传文本表格文件（{', '.join(supported_formats)}）"
         )
-    content = await file.read()
+    content = file.file.read()
     if not content:
         logger.warning(f"用户{current_user['username']}上传空文件：{file.filename}")
         raise HTTPException(status_code=400, detail="上传文件为空，无有效数据")
@@ -488,11 +488,11 @@ async def import_groups(
         "示例 current_user: {\"sub\": 3, \"roles\": [\"teacher\"], \"username\": \"li\"}"
     )
 )
-async def create_group(
+def create_group(
     group_name: str,
     group_id: str | None = None,
     teacher_id: str | None = None,
-    description: str | None = None,
+    description: str | None = Query(None, max_length=512),
     current_user: Optional[str] = Query(None, description="当前登录用户信息(JSON字符串)，示例: {\"sub\":1,\"roles\":[\"admin\"],\"username\":\"admin\"}")
 ):
     cu = _parse_current_user(current_user)
@@ -572,7 +572,7 @@ async def create_group(
     summary="绑定群组",
     description="将用户绑定到指定群组"
 )
-async def bind_group(
+def bind_group(
     group_id: str,
     group_name: str,
     member_type: str,  # 只能是 teacher 或 student
@@ -661,7 +661,7 @@ async def bind_group(
     summary="删除群组",
     description="根据群组编号删除群组及其所有成员关系"
 )
-async def delete_group(
+def delete_group(
     group_id: str,
     current_user: Optional[str] = Query(None, description="当前登录用户信息(JSON字符串)，示例: {\"sub\":1,\"roles\":[\"admin\"],\"username\":\"admin\"}")
 ):
@@ -715,7 +715,7 @@ async def delete_group(
     summary="更新群组",
     description="更新群组信息（群名/教师/描述），仅群主或群组管理员可更新"
 )
-async def update_group(
+def update_group(
     group_id: str, 
     payload: GroupUpdate,
     current_user: Optional[str] = Header(None, alias="X-Current-User", description="当前登录用户信息(JSON字符串)，示例: {\"sub\":1,\"roles\":[\"admin\"],\"username\":\"admin\"}")
@@ -795,7 +795,7 @@ async def update_group(
     summary="添加群组成员或获取教师负责的学生列表",
     description="为指定群组添加成员（单个或批量），或获取教师负责的学生列表"
 )
-async def add_group_member(
+def add_group_member(
     action: str = Query("add", description="操作类型: add(添加成员) 或 list_students(获取学生列表)", enum=["add", "list_students"]),
     group_id: str | None = Query(None, description="群组ID（add操作时必填）"),
     student_id: Optional[str] = Query(None, description="单个学生学号（add操作时可选）"),
@@ -1009,7 +1009,7 @@ async def add_group_member(
     summary="删除群组成员",
     description="从指定群组移除成员（软删除，设置 is_active=0）"
 )
-async def remove_group_member(
+def remove_group_member(
     group_id: str,
     student_id: Optional[str] = Query(None, description="学生学号（member_type为student时必填）"),
     teacher_id: Optional[str] = Query(None, description="教师工号（member_type为teacher时必填）"),
@@ -1116,7 +1116,7 @@ async def remove_group_member(
     summary="获取群组成员信息",
     description="获取指定群组成员列表，可按成员类型筛选"
 )
-async def get_group_members(
+def get_group_members(
     group_id: str,
     member_type: Optional[str] = Query(None, description="成员类型筛选：student/teacher/admin"),
     include_inactive: bool = Query(False, description="是否包含已移除成员"),
@@ -1268,7 +1268,7 @@ async def get_group_members(
     summary="获取班级学生列表",
     description="获取指定班级的所有学生及其论文状态"
 )
-async def get_class_students(
+def get_class_students(
     group_id: str,
     current_user: str = Query('{"sub": 1, "roles": ["admin"], "username": "admin"}', description="当前登录用户信息(JSON字符串)，示例: {\"sub\":1,\"roles\":[\"admin\"],\"username\":\"admin\"}")
 ):
@@ -1372,7 +1372,7 @@ async def get_class_students(
     summary="查看群组论文列表",
     description="老师查看指定群组的所有成员提交的论文信息"
 )
-async def get_group_papers(
+def get_group_papers(
     teacher_id: str = Query(..., description="教师ID"),
     group_id: str = Query(..., description="群组ID"),
     current_user: str = Query('{"sub": 1, "roles": ["admin"], "username": "admin"}', description="当前登录用户信息(JSON字符串)，示例: {\"sub\":1,\"roles\":[\"admin\"],\"username\":\"admin\"}")
@@ -1495,7 +1495,7 @@ async def get_group_papers(
     summary="批量下载群组论文",
     description="管理员或老师批量下载指定群组的学生论文，支持zip和原格式下载"
 )
-async def batch_download_papers(
+def batch_download_papers(
     group_id: str,
     student_ids: List[int] | None = None,
     format: str = "zip",
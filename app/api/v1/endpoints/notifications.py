@@ -2,7 +2,7 @@ from fastapi import APIRouter, Depends, HTTPException, Query
 from pydantic import BaseModel
 from typing import Optional
 from datetime import datetime
-import json
+import orjson
 import pymysql
 
 from app.database import get_db
@@ -43,7 +43,7 @@ def push_notification(
         try:
             import urllib.parse
             current_user = urllib.parse.unquote(current_user)
-            current_user_data = json.loads(current_user)
+            current_user_data = orjson.loads(current_user)
             sender_id = str(current_user_data.get("sub"))
             sender_roles = current_user_data.get("roles", [])
             sender_role = sender_roles[0] if sender_roles else "user"
@@ -83,7 +83,7 @@ def push_notification(
         metadata["sender_id"] = sender_id
         metadata["sender_role"] = sender_role
 
-        metadata_json = json.dumps(metadata, ensure_ascii=False) if metadata else None
+        metadata_json = orjson.dumps(metadata).decode() if metadata else None
         source_value = "system"  # 固定来源
         
         # 7. 组装插入SQL
@@ -160,7 +160,7 @@ def query_notifications(
     try:
         import urllib.parse
         current_user = urllib.parse.unquote(current_user)
-        current_user_data = json.loads(current_user)
+        current_user_data = orjson.loads(current_user)
         user_roles = current_user_data.get("roles", [])
         
         # 验证用户类型选择是否与实际身份一致
@@ -173,7 +173,7 @@ def query_notifications(
         else:
             raise HTTPException(status_code=400, detail="用户类型必须是 admin 或 teacher")
             
-    except json.JSONDecodeError:
+    except orjson.JSONDecodeError:
         raise HTTPException(status_code=403, detail="无效的用户信息格式")
     except HTTPException:
         raise
@@ -251,7 +251,7 @@ def query_notifications(
         for row in rows:
             # row结构：(id, user_id, username, title, content, source, status, received_time, metadata)
             try:
-                metadata = json.loads(row[8]) if row[8] else {}
+                metadata = orjson.loads(row[8]) if row[8] else {}
             except Exception:
                 metadata = {}
             sender_id = metadata.get("sender_id")
@@ -335,7 +335,7 @@ def update_notification(
             existing_metadata = cursor.fetchone()[0]
             if existing_metadata:
                 try:
-                    existing_metadata = json.loads(existing_metadata)
+                    existing_metadata = orjson.loads(existing_metadata)
                     # 合并现有metadata
                     existing_metadata.update(metadata)
                     metadata = existing_metadata
@@ -345,7 +345,7 @@ def update_notification(
             updates.append("content = %s")
             params.append(content_value)
             updates.append("metadata = %s")
-            params.append(json.dumps(metadata, ensure_ascii=False) if metadata else None)
+            params.append(orjson.dumps(metadata).decode() if metadata else None)
         
         updates.append("updated_at = %s")
         params.append(now_str)
@@ -9,7 +9,6 @@ import sys
 import shutil
 import subprocess
 import tempfile
-from app.core.dependencies import get_current_user
 from app.schemas.document import (
     PaperOut,
     PaperStatusOut,
@@ -20,12 +19,8 @@ from app.services.oss import get_file_from_oss, upload_paper_to_storage
 from datetime import datetime
 from app.database import get_db
 import pymysql
-import json
-
-try:
-    from docx2pdf import convert as docx2pdf_convert
-except ImportError:
-    docx2pdf_convert = None
+import orjson
+from functools import lru_cache
 
 router = APIRouter()
 
@@ -40,7 +35,7 @@ def _parse_current_user(current_user: Optional[str]) -> dict:
             return {"sub": 0, "username": "", "roles": []}
         if raw.isdigit():
             return {"sub": int(raw), "username": f"user{raw}", "roles": ["student"]}
-        data = json.loads(raw)
+        data = orjson.loads(raw)
         if isinstance(data, dict):
             sub_value = data.get("sub", 0)
             if isinstance(sub_value, str) and sub_value.isdigit():
@@ -82,6 +77,15 @@ def _find_soffice_binary() -> Optional[str]:
             return path
     return None
 
+@lru_cache(maxsize=None)
+def _get_docx2pdf_convert():
+    """首次在非 Linux 平台转换时才导入 docx2pdf（Linux 使用 LibreOffice，进程内永不加载）；未安装返回 None"""
+    try:
+        from docx2pdf import convert
+    except ImportError:
+        return None
+    return convert
+
 def convert_docx_to_pdf(docx_content: bytes, filename: str) -> tuple:
     pdf_filename = os.path.splitext(filename)[0] + '.pdf'
     try:
@@ -115,6 +119,7 @@ def convert_docx_to_pdf(docx_content: bytes, filename: str) -> tuple:
                     )
                 pdf_path = os.path.join(tmpdir, pdf_filename)
             else:
+                docx2pdf_convert = _get_docx2pdf_convert()
                 if not docx2pdf_convert:
                     raise HTTPException(
                         status_code=500,
@@ -148,7 +153,7 @@ def convert_docx_to_pdf(docx_content: bytes, filename: str) -> tuple:
     summary="上传论文",
     description="上传 docx 生成论文记录与首个版本，并记录提交者信息"
 )
-async def upload_paper(
+def upload_paper(
     file: UploadFile = File(...),
     owner_id: int = Query(..., description="论文归属者ID，必须传入且为有效整数"),
     teacher_id: int = Query(..., description="关联的老师ID，必须传入且为有效正整数"),
@@ -170,7 +175,7 @@ async def upload_paper(
     # 验证文件扩展名
     if not file.filename.lower().endswith(".docx"):
         raise HTTPException(status_code=400, detail="仅支持 .docx 格式")
-    contents = await file.read()
+    contents = file.file.read()
     size = len(contents)
     if size > 100 * 1024 * 1024:
         raise HTTPException(status_code=400, detail="文件大小超过 100MB")
@@ -260,7 +265,7 @@ async def upload_paper(
     summary="更新论文",
     description="上传新版本并更新论文的最新版本信息"
 )
-async def update_paper(
+def update_paper(
     paper_id: int,
     file: UploadFile = File(...),
     version: str = Query(..., description="新版本号（必填，格式如v2.0，必须大于当前最新版本）"),
@@ -272,7 +277,7 @@ async def update_paper(
     # 文件校验
     if not file.filename.lower().endswith(".docx"):
         raise HTTPException(status_code=400, detail="仅支持 .docx 格式")
-    contents = await file.read()
+    contents = file.file.read()
     size = len(contents)
     if size == 0:
         raise HTTPException(status_code=400, detail="文件为空")
@@ -943,7 +948,7 @@ def list_versions(
     summary="查询当前用户所有论文",
     description="输入学生ID，仅当与登录用户ID一致时返回该学生的所有论文基础信息"
 )
-async def list_student_papers(
+def list_student_papers(
     owner_id: int = Query(..., description="要查询的学生ID（论文所有者ID），必须传入且为有效整数"),
     db: pymysql.connections.Connection = Depends(get_db),
     current_user: Optional[str] = Query(None, description="登录用户信息(JSON字符串，包含 sub/username/roles)"),
@@ -3,10 +3,11 @@ from __future__ import annotations
 from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Query, Body
 import csv
 import io
+import orjson
 import pymysql
+from functools import lru_cache
 from typing import List, Optional, Dict, Any
 from pydantic import BaseModel, Field
-from datetime import datetime
 from app.schemas.user import (
     StudentCreate,
     TeacherCreate,
@@ -18,29 +19,76 @@ from app.schemas.user import (
     LoginRequest,
     LoginResponse,
 )
-from app.database import get_db
+from app.database import get_db, get_db_read
 from app.core.dependencies import get_current_user
 from app.core.security import create_access_token, get_password_hash, verify_password
 from loguru import logger
 
 
-def _parse_current_user(current_user: Optional[str]) -> dict:
+# MySQL 8 错误码：SELECT ... FOR UPDATE NOWAIT 无法立即获得行锁
+_ER_LOCK_NOWAIT = 3572
+
+# 教师审阅可设置的论文状态（元组保留提示信息中的顺序，frozenset 用于成员判断）
+_REVIEW_STATUS_ORDER = ("已审阅", "已通过", "待更新")
+_ALLOWED_STATUSES = frozenset(_REVIEW_STATUS_ORDER)
+_ALLOWED_STATUSES_TEXT = ", ".join(_REVIEW_STATUS_ORDER)
+_TEACHER_ROLES = frozenset(("teacher", "教师"))
+
+# 审阅接口的热点语句：锁定论文行并取出写历史记录所需字段；
+# 同时带回数据库时间 NOW()，本次操作的各时间字段统一使用该值，不依赖应用服务器时钟
+_PAPER_LOCK_SQL = """
+SELECT id, teacher_id, owner_id, version, oss_key, size, status, detail,
+       submitted_by_name, submitted_by_role, NOW()
+FROM papers WHERE id = %s
+FOR UPDATE NOWAIT
+"""
+
+# 批量审阅单次最多处理的条目数：限制 IN 列表与行锁数量，保证多行 INSERT 远低于 max_allowed_packet
+_BULK_REVIEW_MAX_ITEMS = 1000
+
+# 审阅操作写入 papers_history 的语句（单条 execute 与批量 executemany 共用）
+_HISTORY_INSERT_SQL = """
+INSERT INTO papers_history (
+    paper_id, version, size, status, detail, oss_key,
+    submitted_by_id, submitted_by_name, submitted_by_role,
+    operated_by, operated_time, created_at, updated_at
+) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+"""
+
+
+def _has_teacher_role(roles) -> bool:
+    """roles 可能是列表或单个字符串"""
+    if isinstance(roles, str):
+        return roles in _TEACHER_ROLES
+    return not _TEACHER_ROLES.isdisjoint(roles)
+
+
+@lru_cache(maxsize=1024)
+def _load_current_user(current_user: str) -> Optional[dict]:
+    """解析 current_user 字符串；结果按原始字符串缓存，同一用户的后续请求无需重复解析"""
     try:
-        if not current_user:
-            return {"sub": 0, "username": "", "roles": []}
         import urllib.parse
         raw = urllib.parse.unquote(current_user)
         if not raw.strip():
-            return {"sub": 0, "username": "", "roles": []}
+            return None
         if raw.isdigit():
             return {"sub": int(raw), "username": f"user{raw}", "roles": ["student"]}
-        import json
-        data = json.loads(raw)
+        data = orjson.loads(raw)
         if isinstance(data, dict):
             return data
     except Exception:
         pass
-    return {"sub": 0, "username": "", "roles": []}
+    return None
+
+
+def _parse_current_user(current_user: Optional[str]) -> dict:
+    if not current_user:
+        return {"sub": 0, "username": "", "roles": []}
+    data = _load_current_user(current_user)
+    if data is None:
+        return {"sub": 0, "username": "", "roles": []}
+    # 返回副本，避免调用方修改缓存中的对象
+    return dict(data)
 
 
 class TeacherSubmitReviewRequest(BaseModel):
@@ -76,6 +124,24 @@ class TeacherUpdateReviewRequest(BaseModel):
 
 
 
+class TeacherBulkReviewRequest(BaseModel):
+    """教师批量更新审阅请求"""
+    items: List[TeacherUpdateReviewRequest] = Field(
+        ..., min_length=1, max_length=_BULK_REVIEW_MAX_ITEMS, description="审阅条目列表（论文ID不可重复）"
+    )
+
+    model_config = {
+        "json_schema_extra": {
+            "example": {
+                "items": [
+                    {"paper_id": 1, "status": "已通过", "review_content": "论文已审阅通过。"},
+                    {"paper_id": 2, "status": "待更新", "review_content": "请补充实验部分。"}
+                ]
+            }
+        }
+    }
+
+
 class UserBindSchool(BaseModel):
     school_id: int
     school_name: Optional[str] = None 
@@ -1164,13 +1230,13 @@ def delete_user(
     summary="一键导入用户",
     description="上传 CSV/TSV 文件批量导入用户（列：username,user_type,email,full_name,role,password 可选）"
 )
-async def import_users(file: UploadFile = File(...), db: pymysql.connections.Connection = Depends(get_db)):
+def import_users(file: UploadFile = File(...), db: pymysql.connections.Connection = Depends(get_db)):
     filename = file.filename or ""
     lower_name = filename.lower()
     if not lower_name.endswith(SUPPORTED_IMPORT_EXTS):
         raise HTTPException(status_code=400, detail="仅支持 .csv 或 .tsv 文件")
 
-    content = await file.read()
+    content = file.file.read()
     if not content:
         raise HTTPException(status_code=400, detail="上传文件为空")
 
@@ -1208,6 +1274,7 @@ async def import_users(file: UploadFile = File(...), db: pymysql.connections.Con
             full_name = (row.get("full_name") or None) and row.get("full_name").strip()
             role = (row.get("role") or default_role).strip() or default_role
             password = (row.get("password") or default_password).strip() or default_password
+            # 同步路由运行在线程池中，bcrypt 计算期间释放 GIL，不阻塞事件循环
             password_hash = get_password_hash(password)
             if not full_name:
                 full_name = username  # 默认使用username作为full_name
@@ -1568,31 +1635,31 @@ def teacher_submit_review(
     if login_user_id <= 0:
         raise HTTPException(status_code=401, detail="请先登录后再操作")
     
-    if not ("teacher" in login_user_roles or "教师" in login_user_roles):
+    if not _has_teacher_role(login_user_roles):
         raise HTTPException(status_code=403, detail="无权限提交审阅：仅教师角色可操作")
     
     cursor = None
     try:
+        db.begin()
         cursor = db.cursor()
         
-        cursor.execute("SELECT id, teacher_id FROM papers WHERE id = %s", (payload.paper_id,))
+        # 锁定论文行，避免并发审阅产生丢失更新；已被锁定时立即返回 409 而非排队等待
+        cursor.execute(_PAPER_LOCK_SQL, (payload.paper_id,))
         paper_row = cursor.fetchone()
         if not paper_row:
             raise HTTPException(status_code=404, detail=f"论文ID {payload.paper_id} 不存在")
         
-        paper_db_id, paper_teacher_id = paper_row
+        (
+            paper_db_id, paper_teacher_id, student_id, version, oss_key, original_size, current_status, _,
+            submitter_name, submitter_role, now,
+        ) = paper_row
         if paper_teacher_id != 0 and paper_teacher_id != login_user_id:
             raise HTTPException(
                 status_code=403,
                 detail=f"无权限提交审阅：论文ID {payload.paper_id} 关联的教师ID为 {paper_teacher_id}，当前登录教师ID为 {login_user_id}"
             )
         
-        now = datetime.now()
-        review_time_str = now.strftime("%Y-%m-%d %H:%M:%S")
-        
-        cursor.execute("SELECT owner_id, latest_version, oss_key, size, status FROM papers WHERE id = %s", (payload.paper_id,))
-        paper_info = cursor.fetchone()
-        student_id, version, oss_key, original_size, current_status = paper_info
+        operator_id = current_user.get("username") or str(login_user_id)
         
         cursor.execute(
             """
@@ -1607,25 +1674,15 @@ def teacher_submit_review(
             (
                 "已审阅",
                 payload.review_content,
-                current_user.get("username") or str(login_user_id),
-                review_time_str,
-                review_time_str,
+                operator_id,
+                now,
+                now,
                 payload.paper_id,
             ),
         )
         
-        history_sql = """
-        INSERT INTO papers_history (
-            paper_id, version, size, status, detail, oss_key,
-            submitted_by_id, submitted_by_name, submitted_by_role,
-            operated_by, operated_time, created_at, updated_at
-        ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-        """
-        cursor.execute("SELECT submitted_by_name, submitted_by_role FROM papers WHERE id = %s", (payload.paper_id,))
-        origin_submit = cursor.fetchone()
-        submitter_name, submitter_role = origin_submit if origin_submit else ("", "")
         cursor.execute(
-            history_sql,
+            _HISTORY_INSERT_SQL,
             (
                 payload.paper_id,
                 version,
@@ -1636,10 +1693,10 @@ def teacher_submit_review(
                 str(student_id),
                 submitter_name,
                 submitter_role,
-                current_user.get("username") or str(login_user_id),
-                review_time_str,
-                review_time_str,
-                review_time_str
+                operator_id,
+                now,
+                now,
+                now
             )
         )
         
@@ -1649,13 +1706,18 @@ def teacher_submit_review(
             "message": "审阅内容提交成功，论文状态已更新为已审阅",
             "paper_id": payload.paper_id,
             "teacher_id": login_user_id,
-            "review_time": review_time_str,
+            "review_time": now.strftime("%Y-%m-%d %H:%M:%S"),
             "review_content": payload.review_content,
             "status": "已审阅"
         }
     
+    except HTTPException:
+        db.rollback()
+        raise
     except pymysql.MySQLError as e:
         db.rollback()
+        if e.args and e.args[0] == _ER_LOCK_NOWAIT:
+            raise HTTPException(status_code=409, detail="提交审阅失败：该论文正在被其他操作更新，请稍后重试")
         raise HTTPException(status_code=500, detail=f"提交审阅失败：数据库操作错误 - {str(e)}")
     finally:
         if cursor:
@@ -1679,39 +1741,37 @@ def teacher_update_review(
     if login_user_id <= 0:
         raise HTTPException(status_code=401, detail="请先登录后再操作")
     
-    if not ("teacher" in login_user_roles or "教师" in login_user_roles):
+    if not _has_teacher_role(login_user_roles):
         raise HTTPException(status_code=403, detail="无权限更新审阅：仅教师角色可操作")
     
-    allowed_statuses = ["已审阅", "已通过", "待更新"]
-    if payload.status not in allowed_statuses:
-        raise HTTPException(status_code=400, detail=f"状态必须是以下之一：{', '.join(allowed_statuses)}")
+    if payload.status not in _ALLOWED_STATUSES:
+        raise HTTPException(status_code=400, detail=f"状态必须是以下之一：{_ALLOWED_STATUSES_TEXT}")
     
     cursor = None
     try:
+        db.begin()
         cursor = db.cursor()
         
-        cursor.execute("SELECT id, teacher_id FROM papers WHERE id = %s", (payload.paper_id,))
+        # 锁定论文行，避免并发审阅产生丢失更新；已被锁定时立即返回 409 而非排队等待
+        cursor.execute(_PAPER_LOCK_SQL, (payload.paper_id,))
         paper_row = cursor.fetchone()
         if not paper_row:
             raise HTTPException(status_code=404, detail=f"论文ID {payload.paper_id} 不存在")
         
-        paper_db_id, paper_teacher_id = paper_row
+        (
+            paper_db_id, paper_teacher_id, student_id, version, oss_key, original_size, _, old_content,
+            submitter_name, submitter_role, now,
+        ) = paper_row
         if paper_teacher_id != 0 and paper_teacher_id != login_user_id:
             raise HTTPException(
                 status_code=403,
                 detail=f"无权限更新审阅：论文ID {payload.paper_id} 关联的教师ID为 {paper_teacher_id}，当前登录教师ID为 {login_user_id}"
             )
         
-        old_content = None
-        now = datetime.now()
-        update_time_str = now.strftime("%Y-%m-%d %H:%M:%S")
-        
-        cursor.execute("SELECT owner_id, latest_version, oss_key, size, detail FROM papers WHERE id = %s", (payload.paper_id,))
-        paper_info = cursor.fetchone()
-        student_id, version, oss_key, original_size, old_content = paper_info
+        operator_id = current_user.get("username") or str(login_user_id)
         
         update_fields = ["status = %s", "operated_by = %s", "operated_time = %s", "updated_at = %s"]
-        update_params = [payload.status, current_user.get("username") or str(login_user_id), update_time_str, update_time_str]
+        update_params = [payload.status, operator_id, now, now]
         
         if payload.review_content is not None:
             update_fields.append("detail = %s")
@@ -1728,18 +1788,8 @@ def teacher_update_review(
             tuple(update_params),
         )
         
-        history_sql = """
-        INSERT INTO papers_history (
-            paper_id, version, size, status, detail, oss_key,
-            submitted_by_id, submitted_by_name, submitted_by_role,
-            operated_by, operated_time, created_at, updated_at
-        ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-        """
-        cursor.execute("SELECT submitted_by_name, submitted_by_role FROM papers WHERE id = %s", (payload.paper_id,))
-        origin_submit = cursor.fetchone()
-        submitter_name, submitter_role = origin_submit if origin_submit else ("", "")
         cursor.execute(
-            history_sql,
+            _HISTORY_INSERT_SQL,
             (
                 payload.paper_id,
                 version,
@@ -1750,10 +1800,10 @@ def teacher_update_review(
                 str(student_id),
                 submitter_name,
                 submitter_role,
-                current_user.get("username") or str(login_user_id),
-                update_time_str,
-                update_time_str,
-                update_time_str
+                operator_id,
+                now,
+                now,
+                now
             )
         )
         
@@ -1766,17 +1816,207 @@ def teacher_update_review(
             "status": payload.status,
             "old_review_content": old_content,
             "new_review_content": payload.review_content,
-            "updated_time": update_time_str
+            "updated_time": now.strftime("%Y-%m-%d %H:%M:%S")
         }
     
+    except HTTPException:
+        db.rollback()
+        raise
     except pymysql.MySQLError as e:
         db.rollback()
+        if e.args and e.args[0] == _ER_LOCK_NOWAIT:
+            raise HTTPException(status_code=409, detail="更新审阅失败：该论文正在被其他操作更新，请稍后重试")
         raise HTTPException(status_code=500, detail=f"更新审阅失败：数据库操作错误 - {str(e)}")
     finally:
         if cursor:
             cursor.close()
 
 
+@router.post(
+    "/teacher/bulk-review",
+    summary="教师批量更新审阅",
+    description="教师在一个事务内批量更新多篇论文的审阅状态与内容，并批量写入论文历史记录"
+)
+def teacher_bulk_review(
+    payload: TeacherBulkReviewRequest,
+    db: pymysql.connections.Connection = Depends(get_db),
+    current_user: Optional[str] = Query('{"sub": 1, "username": "teacher1", "roles": ["teacher"]}', description="登录用户信息(JSON字符串，包含 sub/username/roles)，示例：{\"sub\":1,\"username\":\"teacher1\",\"roles\":[\"teacher\"]}"),
+):
+    current_user = _parse_current_user(current_user)
+    login_user_id = current_user.get("sub", 0)
+    login_user_roles = current_user.get("roles", [])
+    
+    if login_user_id <= 0:
+        raise HTTPException(status_code=401, detail="请先登录后再操作")
+    
+    if not _has_teacher_role(login_user_roles):
+        raise HTTPException(status_code=403, detail="无权限更新审阅：仅教师角色可操作")
+    
+    for item in payload.items:
+        if item.status not in _ALLOWED_STATUSES:
+            raise HTTPException(status_code=400, detail=f"论文ID {item.paper_id} 的状态必须是以下之一：{_ALLOWED_STATUSES_TEXT}")
+    
+    paper_ids = [item.paper_id for item in payload.items]
+    if len(set(paper_ids)) != len(paper_ids):
+        raise HTTPException(status_code=400, detail="论文ID不可重复")
+    
+    cursor = None
+    try:
+        db.begin()
+        cursor = db.cursor()
+        
+        # 一次查询并锁定全部论文行
+        cursor.execute(
+            """
+            SELECT id, teacher_id, owner_id, version, oss_key, size,
+                   submitted_by_name, submitted_by_role, NOW()
+            FROM papers WHERE id IN %s
+            FOR UPDATE NOWAIT
+            """,
+            (tuple(paper_ids),),
+        )
+        paper_rows = {row[0]: row for row in cursor.fetchall()}
+        
+        missing_ids = [pid for pid in paper_ids if pid not in paper_rows]
+        if missing_ids:
+            raise HTTPException(status_code=404, detail=f"论文ID {', '.join(map(str, missing_ids))} 不存在")
+        
+        for pid in paper_ids:
+            paper_teacher_id = paper_rows[pid][1]
+            if paper_teacher_id != 0 and paper_teacher_id != login_user_id:
+                raise HTTPException(
+                    status_code=403,
+                    detail=f"无权限更新审阅：论文ID {pid} 关联的教师ID为 {paper_teacher_id}，当前登录教师ID为 {login_user_id}"
+                )
+        
+        # 各行在同一语句中取到的 NOW() 相同，取任意一行即可
+        now = paper_rows[paper_ids[0]][8]
+        operator_id = current_user.get("username") or str(login_user_id)
+        
+        update_rows = []
+        history_rows = []
+        for item in payload.items:
+            _, _, student_id, version, oss_key, original_size, submitter_name, submitter_role, _ = paper_rows[item.paper_id]
+            update_rows.append(
+                (item.status, operator_id, now, now, item.review_content, item.paper_id)
+            )
+            history_rows.append(
+                (
+                    item.paper_id,
+                    version,
+                    original_size,
+                    item.status,
+                    item.review_content,
+                    oss_key,
+                    str(student_id),
+                    submitter_name,
+                    submitter_role,
+                    operator_id,
+                    now,
+                    now,
+                    now
+                )
+            )
+        
+        # review_content 为空时保留原审阅内容
+        cursor.executemany(
+            """
+            UPDATE papers
+            SET status = %s, operated_by = %s, operated_time = %s, updated_at = %s,
+                detail = COALESCE(%s, detail)
+            WHERE id = %s
+            """,
+            update_rows,
+        )
+        # INSERT ... VALUES 形式会被 pymysql 改写为单条多行插入
+        cursor.executemany(_HISTORY_INSERT_SQL, history_rows)
+        
+        db.commit()
+        
+        return {
+            "message": "批量审阅更新成功",
+            "teacher_id": login_user_id,
+            "updated_count": len(payload.items),
+            "items": [{"paper_id": item.paper_id, "status": item.status} for item in payload.items],
+            "updated_time": now.strftime("%Y-%m-%d %H:%M:%S")
+        }
+    
+    except HTTPException:
+        db.rollback()
+        raise
+    except pymysql.MySQLError as e:
+        db.rollback()
+        if e.args and e.args[0] == _ER_LOCK_NOWAIT:
+            raise HTTPException(status_code=409, detail="批量更新审阅失败：部分论文正在被其他操作更新，请稍后重试")
+        raise HTTPException(status_code=500, detail=f"批量更新审阅失败：数据库操作错误 - {str(e)}")
+    finally:
+        if cursor:
+            cursor.close()
+
+
+@router.get(
+    "/teacher/papers-with-review",
+    summary="教师论文及最新审阅列表",
+    description="分页返回当前教师名下的论文、提交者信息及每篇论文最新一条历史记录中的审阅内容，可按状态筛选"
+)
+def teacher_papers_with_review(
+    status: Optional[str] = Query(None, description="按论文状态筛选，如 已审阅/已通过/待更新"),
+    page: int = Query(1, ge=1, description="页码（从1开始）"),
+    page_size: int = Query(20, ge=1, le=100, description="每页条数（1-100）"),
+    db: pymysql.connections.Connection = Depends(get_db_read),
+    current_user: Optional[str] = Query('{"sub": 1, "username": "teacher1", "roles": ["teacher"]}', description="登录用户信息(JSON字符串，包含 sub/username/roles)，示例：{\"sub\":1,\"username\":\"teacher1\",\"roles\":[\"teacher\"]}"),
+):
+    current_user = _parse_current_user(current_user)
+    login_user_id = current_user.get("sub", 0)
+    login_user_roles = current_user.get("roles", [])
+    
+    if login_user_id <= 0:
+        raise HTTPException(status_code=401, detail="请先登录后再操作")
+    
+    if not _has_teacher_role(login_user_roles):
+        raise HTTPException(status_code=403, detail="无权限查看：仅教师角色可操作")
+    
+    where_sql = " WHERE p.teacher_id = %s"
+    params: List[Any] = [login_user_id]
+    if status:
+        where_sql += " AND p.status = %s"
+        params.append(status)
+
+    # 当前页的论文与其最新一条历史记录（MAX(id)）一次 JOIN 取回，避免逐篇查询审阅内容
+    sql = """
+        SELECT p.id AS paper_id, p.owner_id, p.version, p.size, p.status,
+               p.submitted_by_name, p.submitted_by_role,
+               DATE_FORMAT(p.updated_at, '%%Y-%%m-%%d %%H:%%i:%%s') AS updated_at,
+               h.detail AS review_content, h.operated_by AS reviewed_by,
+               DATE_FORMAT(h.operated_time, '%%Y-%%m-%%d %%H:%%i:%%s') AS reviewed_time
+        FROM papers p
+        LEFT JOIN papers_history h
+               ON h.id = (SELECT MAX(id) FROM papers_history WHERE paper_id = p.id)
+    """ + where_sql + " ORDER BY p.updated_at DESC LIMIT %s OFFSET %s"
+
+    cursor = None
+    try:
+        cursor = db.cursor(pymysql.cursors.DictCursor)
+        cursor.execute("SELECT COUNT(*) AS total FROM papers p" + where_sql, tuple(params))
+        total = cursor.fetchone()["total"]
+        cursor.execute(sql, (*params, page_size, (page - 1) * page_size))
+        items = cursor.fetchall()
+        return {
+            "teacher_id": login_user_id,
+            "items": items,
+            "page": page,
+            "page_size": page_size,
+            "total": total,
+            "total_pages": (total + page_size - 1) // page_size,
+        }
+    except pymysql.MySQLError as e:
+        logger.error(f"查询教师论文审阅列表数据库错误: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"查询论文审阅列表失败：数据库操作错误 - {str(e)}")
+    finally:
+        if cursor:
+            cursor.close()
+
+
 USER_TABLES_MAP: Dict[str, Dict[str, str]] = {
     "student": {
         "table": "students",
@@ -13,6 +13,8 @@ from app.api.v1.endpoints import (
 	users,
 )
 
+__all__ = ["api_router"]
+
 api_router = APIRouter()
 
 # 注册各个端点路由
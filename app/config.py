@@ -1,10 +1,14 @@
 from __future__ import annotations
 
+import os
+from functools import lru_cache
 from typing import List
 
-from pydantic import SecretStr
+from pydantic import Field, SecretStr
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
+__all__ = ["Settings", "get_settings", "settings"]
+
 
 class Settings(BaseSettings):
     model_config = SettingsConfigDict(
@@ -27,6 +31,15 @@ class Settings(BaseSettings):
     PORT: int = 8000
     DEBUG: bool = False
     RELOAD: bool = True
+    # Serve /docs, /redoc and /openapi.json (also enabled by DEBUG); off by default so production hides them
+    DOCS_ENABLED: bool = False
+    # uvicorn worker processes (ignored when RELOAD is on)
+    WORKERS: int = Field(default_factory=lambda: os.cpu_count() or 1)
+    # Bind a UNIX domain socket instead of HOST:PORT (e.g. behind nginx on the same host)
+    UDS_PATH: str | None = None
+    # Threads available to sync (def) endpoints per worker. Unset: the worker's DB pool capacity; never
+    # more than that, since extra threads could only block waiting for a pooled connection
+    THREADPOOL_SIZE: int | None = None
 
     # Database (can provide full DATABASE_URL or MYSQL_* parts)
     DATABASE_URL: str | None = None
@@ -35,10 +48,26 @@ class Settings(BaseSettings):
     MYSQL_USER: str 
     MYSQL_PASSWORD: str 
     MYSQL_DATABASE: str
+    # Optional read replica host for read-only endpoints (same port/credentials/database as primary)
+    MYSQL_READ_HOST: str | None = None
+    # Per-worker connection pool (app.database); DB_POOL_SIZE=0 disables pooling
+    DB_POOL_SIZE: int = 20
+    DB_MAX_OVERFLOW: int = 10
+    # Seconds to wait for a free pooled connection before answering 503
+    DB_POOL_TIMEOUT: float = 5.0
+    DB_POOL_RECYCLE: int = 1800
+    # Connections all WORKERS together may open to one MySQL server (keep below its max_connections,
+    # 151 by default); each worker's pool is scaled down to its share when SIZE + OVERFLOW exceed it
+    DB_MAX_CONNECTIONS: int = 120
+    # AI review micro-batching: max reviews per AI call, and how long to wait for a batch to fill
+    AI_BATCH_SIZE: int = 8
+    AI_BATCH_WAIT_MS: int = 50
     # Auth
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60
     SECRET_KEY: SecretStr = SecretStr("change-me")
     ALGORITHM: str = "HS256"
+    # bcrypt cost factor; each +1 doubles hashing time. Existing hashes keep verifying at their own cost.
+    BCRYPT_ROUNDS: int = 10
 
     def parse_cors(self) -> List[str]:
         v = self.CORS_ORIGINS
@@ -55,16 +84,19 @@ class Settings(BaseSettings):
         return ["*"]
 
 
-# Instantiate settings and compute DATABASE_URL if not provided
-_settings = Settings()
-# parse CORS origins into a list and compute DATABASE_URL if needed
-cors_list = _settings.parse_cors()
-if not _settings.DATABASE_URL:
-    _database_url = (
-        f"mysql+pymysql://{_settings.MYSQL_USER}:{_settings.MYSQL_PASSWORD}"
-        f"@{_settings.MYSQL_HOST}:{_settings.MYSQL_PORT}/{_settings.MYSQL_DATABASE}?charset=utf8mb4"
-    )
-    settings = _settings.model_copy(update={"DATABASE_URL": _database_url, "CORS_ORIGINS": cors_list})
-else:
-    settings = _settings.model_copy(update={"CORS_ORIGINS": cors_list})
+@lru_cache(maxsize=None)
+def get_settings() -> Settings:
+    """Build settings once per process: reads env/.env, parses CORS and computes DATABASE_URL if needed."""
+    _settings = Settings()
+    # parse CORS origins into a list and compute DATABASE_URL if needed
+    cors_list = _settings.parse_cors()
+    if not _settings.DATABASE_URL:
+        _database_url = (
+            f"mysql+pymysql://{_settings.MYSQL_USER}:{_settings.MYSQL_PASSWORD}"
+            f"@{_settings.MYSQL_HOST}:{_settings.MYSQL_PORT}/{_settings.MYSQL_DATABASE}?charset=utf8mb4"
+        )
+        return _settings.model_copy(update={"DATABASE_URL": _database_url, "CORS_ORIGINS": cors_list})
+    return _settings.model_copy(update={"CORS_ORIGINS": cors_list})
+
 
+settings = get_settings()
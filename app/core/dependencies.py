@@ -1,34 +1,61 @@
 """
 依赖注入
 """
-from typing import Generator
+import time
+from functools import lru_cache
+from typing import Optional
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-import pymysql
-from app.database import get_db
 from app.core.security import decode_access_token
 
 security = HTTPBearer()
 
 
+@lru_cache(maxsize=4096)
+def _decode_token_cached(token: str) -> Optional[dict]:
+    """按 token 缓存解码结果，同一会话内重复请求无需再次做签名校验"""
+    return decode_access_token(token)
+
+
+def _get_token_payload(token: str) -> Optional[dict]:
+    payload = _decode_token_cached(token)
+    if payload is None:
+        return None
+    # 缓存命中时 jwt.decode 不会再执行，按同样规则重新检查随时间变化的声明（类型已在首次解码时校验）：
+    # exp 已过期、nbf 或 iat 尚未到达的 token 均视为无效
+    now = time.time()
+    exp = payload.get("exp")
+    if exp is not None and exp <= now:
+        return None
+    for claim in ("nbf", "iat"):
+        value = payload.get(claim)
+        if value is not None and value > now:
+            return None
+    user = dict(payload)
+    # token 中的 sub 为字符串形式的用户自增ID，转回整数供路由直接用于查询与比较
+    sub = user.get("sub")
+    if isinstance(sub, str) and sub.isdigit():
+        user["sub"] = int(sub)
+    return user
+
+
 def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: pymysql.connections.Connection = Depends(get_db)
 ):
     """
     获取当前用户
-    从JWT token中解析用户信息
+    从JWT token中解析用户信息（无效 token 的解码结果同样会被缓存）
     """
     token = credentials.credentials
-    payload = decode_access_token(token)
-    
+    payload = _get_token_payload(token)
+
     if payload is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="无效的认证凭据",
             headers={"WWW-Authenticate": "Bearer"},
         )
-    
-    # 这里应该使用原生 SQL 通过 `db.cursor()` 查询用户信息并返回用户对象
-    return payload  # 临时返回payload，实际使用时应该返回用户对象
 
+    # 这里应该使用原生 SQL 查询用户信息并返回用户对象；
+    # 实现时按需注入 `get_db`，并对查询结果做短时缓存，避免每个请求都访问数据库
+    return payload  # 临时返回payload，实际使用时应该返回用户对象
@@ -8,6 +8,15 @@ from jwt.exceptions import InvalidTokenError
 import bcrypt
 from app.config import settings
 
+# 签名密钥与算法在模块加载时取一次；SECRET_KEY 为 SecretStr，PyJWT 需要原始字节
+_SECRET = (
+    settings.SECRET_KEY.get_secret_value()
+    if hasattr(settings.SECRET_KEY, "get_secret_value")
+    else settings.SECRET_KEY
+).encode("utf-8")
+_ALGO = settings.ALGORITHM
+_ALGOS = [_ALGO]
+
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """验证密码"""
@@ -24,8 +33,8 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
 
 def get_password_hash(password: str) -> str:
     """获取密码哈希值"""
-    # 生成salt并哈希密码
-    salt = bcrypt.gensalt()
+    # 生成salt并哈希密码（cost 由配置控制，默认 10，避免在请求线程上长时间占用 CPU）
+    salt = bcrypt.gensalt(rounds=settings.BCRYPT_ROUNDS)
     if isinstance(password, str):
         password = password.encode('utf-8')
     hashed = bcrypt.hashpw(password, salt)
@@ -35,20 +44,23 @@ def get_password_hash(password: str) -> str:
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """创建访问令牌"""
     to_encode = data.copy()
+    # JWT 规范要求 sub 为字符串（PyJWT 解码时会拒绝整数 sub），用户自增ID在此统一转为字符串
+    if to_encode.get("sub") is not None:
+        to_encode["sub"] = str(to_encode["sub"])
     if expires_delta:
         expire = datetime.utcnow() + expires_delta
     else:
         expire = datetime.utcnow() + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     
     to_encode.update({"exp": expire})
-    encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+    encoded_jwt = jwt.encode(to_encode, _SECRET, algorithm=_ALGO)
     return encoded_jwt
 
 
 def decode_access_token(token: str) -> Optional[dict]:
     """解码访问令牌"""
     try:
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+        payload = jwt.decode(token, _SECRET, algorithms=_ALGOS)
         return payload
     except InvalidTokenError:
         return None
@@ -0,0 +1,29 @@
+"""
+压缩中间件
+"""
+import re
+
+from starlette.middleware.gzip import GZipMiddleware
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.static_config import ESSAY_MOUNT_PATH
+
+# 文件下载（zip/docx/pdf 本身已压缩）与静态论文文件再做 gzip 只浪费 CPU
+_UNCOMPRESSED_PATH_RE = re.compile(rf"(?:/download(?:/|$)|^{re.escape(ESSAY_MOUNT_PATH)}/)")
+
+
+class SelectiveGZipMiddleware:
+    """GZip 压缩中间件：小于 minimum_size 的响应与文件下载路由直接透传。
+
+    text/event-stream 响应由 Starlette 的 GZipMiddleware 自行跳过，不会被缓冲。
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: int = 4096) -> None:
+        self.app = app
+        self.gzip = GZipMiddleware(app, minimum_size=minimum_size)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http" and not _UNCOMPRESSED_PATH_RE.search(scope["path"]):
+            await self.gzip(scope, receive, send)
+        else:
+            await self.app(scope, receive, send)
@@ -0,0 +1,63 @@
+"""
+CORS 中间件
+"""
+from typing import Iterable
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+_ALLOW_METHODS = b"DELETE, GET, HEAD, OPTIONS, PATCH, POST, PUT"
+_PREFLIGHT_MAX_AGE = b"600"
+
+
+class FastCORSMiddleware:
+    """轻量 CORS 中间件（纯 ASGI）：响应头在启动时预先编码，预检请求直接返回 204。
+
+    允许的来源原样回显 Origin 并附带 Vary: Origin（携带凭证时浏览器不接受 `*`）；
+    不带 Origin 的请求（同源、服务间调用、健康检查）不做任何处理。
+    """
+
+    def __init__(self, app: ASGIApp, allow_origins: Iterable[str] = ("*",), allow_credentials: bool = True) -> None:
+        self.app = app
+        origins = list(allow_origins)
+        self.allow_all = "*" in origins
+        self.allow_origins = frozenset(o.encode("latin-1") for o in origins)
+        self.common_headers = [(b"vary", b"Origin")]
+        if allow_credentials:
+            self.common_headers.append((b"access-control-allow-credentials", b"true"))
+        self.preflight_headers = self.common_headers + [
+            (b"access-control-allow-methods", _ALLOW_METHODS),
+            (b"access-control-max-age", _PREFLIGHT_MAX_AGE),
+        ]
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        origin = request_headers = None
+        for name, value in scope["headers"]:
+            if name == b"origin":
+                origin = value
+            elif name == b"access-control-request-headers":
+                request_headers = value
+        if origin is None or not (self.allow_all or origin in self.allow_origins):
+            await self.app(scope, receive, send)
+            return
+
+        allow_origin = [(b"access-control-allow-origin", origin)]
+        if scope["method"] == "OPTIONS" and any(name == b"access-control-request-method" for name, _ in scope["headers"]):
+            headers = allow_origin + self.preflight_headers
+            if request_headers:
+                headers.append((b"access-control-allow-headers", request_headers))
+            await send({"type": "http.response.start", "status": 204, "headers": headers})
+            await send({"type": "http.response.body", "body": b""})
+            return
+
+        extra_headers = allow_origin + self.common_headers
+
+        async def send_with_cors(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                message["headers"] = [*message.get("headers", ()), *extra_headers]
+            await send(message)
+
+        await self.app(scope, receive, send_with_cors)
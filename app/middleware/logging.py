@@ -2,43 +2,50 @@
 日志中间件
 """
 import time
-from fastapi import Request
-from starlette.middleware.base import BaseHTTPMiddleware
 from loguru import logger
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 
-class LoggingMiddleware(BaseHTTPMiddleware):
-    """请求日志中间件"""
-    
-    async def dispatch(self, request: Request, call_next):
-        start_time = time.time()
-        
+class LoggingMiddleware:
+    """请求日志中间件（纯 ASGI）：记录请求与响应状态码、耗时，并写入 X-Process-Time 响应头。
+
+    不使用 BaseHTTPMiddleware，响应不经过额外的任务与内存流转发。
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start_time = time.perf_counter_ns()
+        method = scope["method"]
+        path = scope["path"]
+        client = scope.get("client")
+        client_host = client[0] if client else "Unknown"
+
         # 记录请求信息
-        logger.info(
-            f"请求: {request.method} {request.url.path} - "
-            f"客户端: {request.client.host if request.client else 'Unknown'}"
-        )
-        
+        logger.info(f"请求: {method} {path} - 客户端: {client_host}")
+
+        async def send_with_timing(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                # 计算处理时间（到响应开始发送为止）
+                process_time = (time.perf_counter_ns() - start_time) / 1e9
+                MutableHeaders(scope=message).append("X-Process-Time", str(process_time))
+                # 记录响应信息
+                logger.info(
+                    f"响应: {method} {path} - "
+                    f"状态码: {message['status']} - "
+                    f"耗时: {process_time:.3f}s"
+                )
+            await send(message)
+
         # 处理请求
         try:
-            response = await call_next(request)
+            await self.app(scope, receive, send_with_timing)
         except Exception:
-            logger.exception(
-                f"请求处理异常: {request.method} {request.url.path} - "
-                f"客户端: {request.client.host if request.client else 'Unknown'}"
-            )
+            logger.exception(f"请求处理异常: {method} {path} - 客户端: {client_host}")
             raise
-        
-        # 计算处理时间
-        process_time = time.time() - start_time
-        
-        # 记录响应信息
-        logger.info(
-            f"响应: {request.method} {request.url.path} - "
-            f"状态码: {response.status_code} - "
-            f"耗时: {process_time:.3f}s"
-        )
-        
-        response.headers["X-Process-Time"] = str(process_time)
-        return response
-
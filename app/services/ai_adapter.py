@@ -1,13 +1,20 @@
 import time
+from typing import List, Tuple
 
 
-def submit_ai_review(paper_id: int, user_payload: dict):
-    """Stub: simulate submitting to AI service and storing a result.
+def submit_ai_reviews(items: List[Tuple[int, dict]]) -> List[dict]:
+    """Stub: submit several (paper_id, user_payload) reviews to the AI service in one call.
 
-    In real app: generate temporary OSS URL, call external AI (via requests or SDK),
-    parse JSON, persist to DB and insert virtual annotations.
+    In real app: generate temporary OSS URLs, send them as one batched request to the
+    external AI (via requests or SDK), parse JSON, persist to DB and insert virtual annotations.
+    Results are returned in the order of `items`.
     """
-    # simulate work / timeout behavior
+    # simulate work / timeout behavior: one round trip regardless of batch size
     time.sleep(0.5)
-    # Return a fake report (in real usage, persist to DB)
-    return {"paper_id": paper_id, "issues": []}
+    # Return fake reports (in real usage, persist to DB)
+    return [{"paper_id": paper_id, "issues": []} for paper_id, _ in items]
+
+
+def submit_ai_review(paper_id: int, user_payload: dict):
+    """Submit a single review; see `submit_ai_reviews`."""
+    return submit_ai_reviews([(paper_id, user_payload)])[0]
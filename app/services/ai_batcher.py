@@ -0,0 +1,107 @@
+import asyncio
+from typing import List, Optional, Tuple
+
+import anyio.to_thread
+from loguru import logger
+
+from app.config import settings
+from app.services.ai_adapter import submit_ai_reviews
+
+# (paper_id, user_payload, future or None when the caller doesn't wait for the report)
+_Item = Tuple[int, dict, Optional[asyncio.Future]]
+
+
+class AIReviewBatcher:
+    """Micro-batches AI review requests: one background task collects up to `max_batch`
+    queued reviews, waiting at most `max_wait` seconds after the first one, and submits
+    them to the AI service as a single call.
+    """
+
+    def __init__(self, max_batch: int = 8, max_wait: float = 0.05, max_queue: int = 1000) -> None:
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self.max_queue = max_queue
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._accepting = False
+
+    async def start(self) -> None:
+        """Start the batching task on the running event loop (app startup)."""
+        if self._worker is None:
+            self._queue = asyncio.Queue(maxsize=self.max_queue)
+            self._worker = asyncio.create_task(self._run())
+            self._accepting = True
+
+    async def stop(self) -> None:
+        """Stop accepting reviews, wait until every queued one has been submitted, then end the
+        batching task (app shutdown, including worker recycling)."""
+        if self._worker is not None:
+            self._accepting = False
+            await self._queue.join()
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+            self._queue = None
+
+    def enqueue(self, paper_id: int, user_payload: dict, future: Optional[asyncio.Future] = None) -> None:
+        """Queue a review without waiting for it; raises RuntimeError when not started or full."""
+        if not self._accepting:
+            raise RuntimeError("AI review batcher is not running")
+        try:
+            self._queue.put_nowait((paper_id, user_payload, future))
+        except asyncio.QueueFull:
+            raise RuntimeError("AI review queue is full") from None
+
+    async def submit(self, paper_id: int, user_payload: dict) -> dict:
+        """Queue a review and wait for its report."""
+        future = asyncio.get_running_loop().create_future()
+        self.enqueue(paper_id, user_payload, future)
+        return await future
+
+    async def _collect(self) -> List[_Item]:
+        batch = [await self._queue.get()]
+        deadline = asyncio.get_running_loop().time() + self.max_wait
+        while len(batch) < self.max_batch:
+            timeout = deadline - asyncio.get_running_loop().time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _run(self) -> None:
+        while True:
+            batch = await self._collect()
+            try:
+                await self._submit(batch)
+            finally:
+                # stop() waits on queue.join() until every collected review has been submitted
+                for _ in batch:
+                    self._queue.task_done()
+
+    async def _submit(self, batch: List[_Item]) -> None:
+        try:
+            # The adapter does blocking HTTP I/O, so the call itself runs on a worker thread
+            results = await anyio.to_thread.run_sync(
+                submit_ai_reviews, [(paper_id, payload) for paper_id, payload, _ in batch]
+            )
+        except Exception as e:
+            logger.exception(f"AI 评审批量提交失败（{len(batch)} 篇）")
+            for _, _, future in batch:
+                if future is not None and not future.done():
+                    future.set_exception(e)
+            return
+        for (_, _, future), result in zip(batch, results):
+            if future is not None and not future.done():
+                future.set_result(result)
+
+
+ai_batcher = AIReviewBatcher(
+    max_batch=settings.AI_BATCH_SIZE,
+    max_wait=settings.AI_BATCH_WAIT_MS / 1000,
+)
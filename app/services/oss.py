@@ -1,3 +1,6 @@
+import stat
+import threading
+from collections import OrderedDict
 from pathlib import Path
 from datetime import datetime
 
@@ -39,11 +42,45 @@ def upload_attachment_to_storage(filename: str, content: bytes) -> str:
     stored_path.write_bytes(content)
     return str(stored_path)
 
+# 进程内文件内容缓存（LRU，按总字节数限额）：键为 (路径, mtime_ns, 大小)，文件被覆盖后自然失效
+_FILE_CACHE_MAX_BYTES = 64 * 1024 * 1024
+_FILE_CACHE_MAX_ITEM_BYTES = 8 * 1024 * 1024
+_file_cache: "OrderedDict[tuple, bytes]" = OrderedDict()
+_file_cache_bytes = 0
+_file_cache_lock = threading.Lock()
+
+
+def _read_file_cached(file_path: Path, st) -> bytes:
+    global _file_cache_bytes
+    key = (str(file_path), st.st_mtime_ns, st.st_size)
+    with _file_cache_lock:
+        content = _file_cache.get(key)
+        if content is not None:
+            _file_cache.move_to_end(key)
+            return content
+    content = file_path.read_bytes()
+    if len(content) != st.st_size or len(content) > _FILE_CACHE_MAX_ITEM_BYTES:
+        # 读取期间文件被改写，或单个文件过大：直接返回，不进缓存
+        return content
+    with _file_cache_lock:
+        if key not in _file_cache:
+            _file_cache[key] = content
+            _file_cache_bytes += len(content)
+            while _file_cache_bytes > _FILE_CACHE_MAX_BYTES:
+                _, evicted = _file_cache.popitem(last=False)
+                _file_cache_bytes -= len(evicted)
+    return content
+
+
 def get_file_from_oss(oss_key: str) -> tuple:
-    """从本地存储读取文件，返回 (文件名, 文件内容)"""
+    """从本地存储读取文件，返回 (文件名, 文件内容)；重复读取同一未修改的文件走进程内缓存"""
     file_path = Path(oss_key)
-    if not file_path.exists() or not file_path.is_file():
+    try:
+        st = file_path.stat()
+    except OSError:
+        st = None
+    if st is None or not stat.S_ISREG(st.st_mode):
         raise KeyError(f"文件不存在: {oss_key}")
-    content = file_path.read_bytes()
+    content = _read_file_cached(file_path, st)
     filename = file_path.name.split("_", 1)[1] 
     return (filename, content)
@@ -0,0 +1,28 @@
+"""Gunicorn settings for production: gunicorn -c gunicorn_conf.py main:app
+
+Gunicorn supervises the uvicorn workers (restart on crash, graceful reload on SIGHUP);
+`uv run main.py` stays the development entrypoint.
+"""
+
+from app.config import settings
+
+bind = f"unix:{settings.UDS_PATH}" if settings.UDS_PATH else f"{settings.HOST}:{settings.PORT}"
+workers = settings.WORKERS
+worker_class = "uvicorn_worker.UvicornWorker"
+
+# Recycle each worker after roughly this many requests to cap slow memory growth;
+# the jitter keeps workers from restarting all at once.
+max_requests = 10000
+max_requests_jitter = 500
+
+# Same listen backlog and keep-alive as the uvicorn.run() entrypoint in main.py
+backlog = 4096
+keepalive = 30
+# Worker heartbeat timeout, not a per-request limit: the arbiter restarts a worker whose event loop has
+# not checked in for this long. Slow sync routes run in the threadpool and don't delay the heartbeat.
+timeout = 60
+graceful_timeout = 30
+
+accesslog = None
+errorlog = "-"
+loglevel = "info"
@@ -2,14 +2,19 @@
 FastAPI 应用主入口：集中创建应用实例、配置中间件与路由。
 """
 
+import stat
+import sys
+from contextlib import asynccontextmanager
 from datetime import datetime
+from pathlib import Path
 
-import app.utils.logger as logger_config
+import app.utils.logger as logger_config  # noqa: F401  导入即完成 loguru 配置
 
-import uvicorn
-from fastapi import FastAPI
-from fastapi.middleware.cors import CORSMiddleware
-from fastapi.middleware.gzip import GZipMiddleware
+import anyio.to_thread
+import orjson
+from fastapi import FastAPI, Request, Response
+from loguru import logger
+from starlette.routing import Route
 from fastapi.openapi.docs import (
 	get_redoc_html,
 	get_swagger_ui_html,
@@ -18,8 +23,12 @@ from fastapi.openapi.docs import (
 
 from app.api.v1.routes import api_router
 from app.config import settings
+from app.database import POOL_CAPACITY, PoolExhaustedError
+from app.services.ai_batcher import ai_batcher
 
 from app.middleware import setup_middleware
+from app.middleware.compression import SelectiveGZipMiddleware
+from app.middleware.cors import FastCORSMiddleware
 from app.static_config import setup_static_files
 
 
@@ -34,28 +43,56 @@ openapi_tags = [
 ]
 
 
+def threadpool_size() -> int:
+	"""同步 def 路由（含 get_db 依赖）使用的 anyio 线程数。
+
+	线程数不超过每个进程的连接池容量：多出的线程只会阻塞在取连接上，
+	还会占住已拿到连接的请求执行路由所需的线程。未启用连接池时默认 40（anyio 默认值）。
+	"""
+	size = settings.THREADPOOL_SIZE or POOL_CAPACITY or 40
+	if POOL_CAPACITY and size > POOL_CAPACITY:
+		logger.warning(f"THREADPOOL_SIZE={size} 超过连接池容量 {POOL_CAPACITY}，按 {POOL_CAPACITY} 个线程运行")
+		size = POOL_CAPACITY
+	return size
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+	"""应用生命周期：启动时按连接池容量设置同步路由使用的线程池并启动 AI 评审批处理任务；退出时先提交完已排队的评审再关闭。"""
+	anyio.to_thread.current_default_thread_limiter().total_tokens = threadpool_size()
+	await ai_batcher.start()
+	yield
+	await ai_batcher.stop()
+
+
+# 接口文档仅在显式开启（DOCS_ENABLED 或 DEBUG）时注册；生产环境（包括 gunicorn 部署）默认不暴露文档入口，
+# worker 启动时也无需构建 OpenAPI 文档
+DOCS_ENABLED = settings.DOCS_ENABLED or settings.DEBUG
+
 app = FastAPI(
 	title=settings.PROJECT_NAME,
 	version=settings.VERSION,
 	description=settings.DESCRIPTION,
-	docs_url="/docs",
-	redoc_url="/redoc",
-	openapi_url="/openapi.json",
+	# /docs 与 /redoc 使用下方 setup_docs 中的自定义页面
+	docs_url=None,
+	redoc_url=None,
+	openapi_url="/openapi.json" if DOCS_ENABLED else None,
+	# 标签说明随文档一起在 setup_docs 中序列化一次，之后不再重复编码
+	openapi_tags=openapi_tags,
+	lifespan=lifespan,
 )
-app.openapi_tags = openapi_tags
 
 
 def setup_middlewares(app: FastAPI) -> None:
-	"""配置 CORS、GZip 及自定义中间件。"""
-	app.add_middleware(
-		CORSMiddleware,
-		allow_origins=settings.CORS_ORIGINS,
-		allow_credentials=True,
-		allow_methods=["*"],
-		allow_headers=["*"],
-	)
-	app.add_middleware(GZipMiddleware, minimum_size=1000)
+	"""配置 CORS、GZip 及自定义中间件。
+
+	add_middleware 后添加的包在最外层，请求处理顺序为 GZip → 自定义中间件 → CORS → 路由：
+	CORS 紧挨路由，预检请求在最内层直接返回；GZip 在最外层，只对最终响应压缩一次。
+	"""
+	app.add_middleware(FastCORSMiddleware, allow_origins=settings.CORS_ORIGINS, allow_credentials=True)
 	setup_middleware(app)
+	# 小响应压缩收益抵不过首字节延迟，4KB 以下不压缩；文件下载路由不压缩
+	app.add_middleware(SelectiveGZipMiddleware, minimum_size=4096)
 
 
 def register_routes(app: FastAPI) -> None:
@@ -63,50 +100,134 @@ def register_routes(app: FastAPI) -> None:
 	app.include_router(api_router, prefix="/api/v1")
 
 
+async def pool_exhausted_handler(request: Request, exc: PoolExhaustedError) -> Response:
+	"""DB_POOL_TIMEOUT 内取不到数据库连接：返回 503 让客户端稍后重试，而不是 500"""
+	return Response(
+		orjson.dumps({"detail": "服务繁忙，请稍后重试"}),
+		status_code=503,
+		media_type="application/json",
+		headers={"Retry-After": "1"},
+	)
+
+
+
+def setup_docs(app: FastAPI) -> None:
+	"""注册 Swagger UI / ReDoc 页面，并预先生成序列化好的 OpenAPI 文档（需在所有路由注册之后调用）。"""
+
+	@app.get("/docs", include_in_schema=False)
+	async def custom_swagger_ui_html():
+		return get_swagger_ui_html(
+			openapi_url=app.openapi_url,
+			title=f"{app.title} - Swagger UI",
+			swagger_ui_parameters={"filter": True},
+		)
+
+	@app.get(app.swagger_ui_oauth2_redirect_url, include_in_schema=False)
+	async def swagger_ui_redirect():
+		return get_swagger_ui_oauth2_redirect_html()
+
+	@app.get("/redoc", include_in_schema=False)
+	async def redoc_html():
+		return get_redoc_html(openapi_url=app.openapi_url, title=f"{app.title} - ReDoc")
+
+	# 文档在进程内不变：生成并序列化一次（worker 启动时完成预热），
+	# /openapi.json 直接返回字节，不再每次请求都对整份文档做 JSON 编码
+	openapi_body = orjson.dumps(app.openapi())
+
+	async def openapi_json(request: Request) -> Response:
+		return Response(openapi_body, media_type="application/json")
+
+	app.router.routes.insert(0, Route(app.openapi_url, openapi_json, methods=["GET"], include_in_schema=False))
+
 
 setup_middlewares(app)
 setup_static_files(app)
 register_routes(app)
+app.add_exception_handler(PoolExhaustedError, pool_exhausted_handler)
+if DOCS_ENABLED:
+	setup_docs(app)
+
+
+# 版本号在进程内不变：健康检查响应体启动时序列化一次，首页只需补上当前时间
+_ROOT_INFO = {
+	"message": "欢迎使用 CD AI 后端 API",
+	"version": settings.VERSION,
+}
+if DOCS_ENABLED:
+	_ROOT_INFO["docs"] = "/docs"
+_HEALTH_BODY = orjson.dumps({"status": "ok", "version": settings.VERSION})
 
 
-@app.get("/docs", include_in_schema=False)
-async def custom_swagger_ui_html():
-	return get_swagger_ui_html(
-		openapi_url=app.openapi_url,
-		title=f"{app.title} - Swagger UI",
-		swagger_ui_parameters={"filter": True},
+async def root(request: Request) -> Response:
+	return Response(
+		orjson.dumps({**_ROOT_INFO, "timestamp": datetime.now().isoformat()}),
+		media_type="application/json",
 	)
 
 
-@app.get(app.swagger_ui_oauth2_redirect_url, include_in_schema=False)
-async def swagger_ui_redirect():
-	return get_swagger_ui_oauth2_redirect_html()
+async def health_check(request: Request) -> Response:
+	"""存活检查（负载均衡/容器探针），不访问数据库。"""
+	# 探针调用频繁：函数体内不要加入 await 或任何阻塞调用（数据库、文件、网络），
+	# 保持直接返回预先序列化的响应体，不让出也不阻塞事件循环
+	return Response(_HEALTH_BODY, media_type="application/json")
 
 
-@app.get("/redoc", include_in_schema=False)
-async def redoc_html():
-	return get_redoc_html(openapi_url=app.openapi_url, title=f"{app.title} - ReDoc")
+# 直接注册为 Starlette 路由并排在最前：跳过 FastAPI 的依赖解析与参数校验，探针请求也无需遍历业务路由
+app.router.routes[:0] = [
+	Route("/", root, methods=["GET"], include_in_schema=False),
+	Route("/health", health_check, methods=["GET"], include_in_schema=False),
+]
+
 
+def prepare_uds(path: str) -> None:
+	"""准备 UNIX 套接字路径：创建所在目录，并删除上次异常退出残留的套接字文件。
 
-@app.get("/", include_in_schema=False)
-async def root():
-	return {
-		"message": "欢迎使用 CD AI 后端 API",
-		"version": settings.VERSION,
-		"timestamp": datetime.now().isoformat(),
-		"docs": "/docs",
-	}
+	多进程模式下 uvicorn 直接 bind 该路径，残留文件会导致启动失败（Address already in use）。
+	"""
+	sock_path = Path(path)
+	sock_path.parent.mkdir(parents=True, exist_ok=True)
+	try:
+		if stat.S_ISSOCK(sock_path.lstat().st_mode):
+			sock_path.unlink()
+	except FileNotFoundError:
+		pass
 
 
 if __name__ == "__main__":
+	# 只有直接运行本文件时才需要 uvicorn 的启动器（含 click 等），由 uvicorn/gunicorn 加载 main:app 时无需导入
+	import uvicorn
+
 	print(f"启动 {settings.PROJECT_NAME} API 服务...")
-	print(f"API 文档地址: http://{settings.HOST}:{settings.PORT}/docs")
+	if settings.UDS_PATH:
+		prepare_uds(settings.UDS_PATH)
+		print(f"监听 UNIX 套接字: {settings.UDS_PATH}")
+	elif DOCS_ENABLED:
+		print(f"API 文档地址: http://{settings.HOST}:{settings.PORT}/docs")
 	print(f"运行模式: {'开发 (热重载)' if settings.RELOAD else '生产'}")
+	workers = None if settings.RELOAD else settings.WORKERS
+	# 开发/调试模式（RELOAD 或 DEBUG）：保留 uvicorn 访问日志与 info 级别日志
+	dev_mode = settings.DEBUG or settings.RELOAD
 	uvicorn.run(
 		"main:app",
 		host=settings.HOST,
 		port=settings.PORT,
+		# 配置后改为监听 UNIX 套接字（忽略 host/port），同机 nginx 反代时省去 TCP 回环开销
+		uds=settings.UDS_PATH,
 		reload=settings.RELOAD,
-		log_level="info",
-		access_log=True,
+		# 热重载与多进程互斥，开发模式下保持单进程
+		workers=workers,
+		# uvloop 不支持 Windows，该平台退回标准 asyncio 事件循环
+		loop="asyncio" if sys.platform == "win32" else "uvloop",
+		http="httptools",
+		# 突发连接较多时加大监听队列，避免 accept 队列溢出导致连接被拒
+		backlog=4096,
+		# 长连接保持 30 秒，减少短请求反复建立 TCP 连接（需小于反向代理的 keepalive 超时）
+		timeout_keep_alive=30,
+		# 过载时超过该并发数直接返回 503，限制单进程内存占用
+		limit_concurrency=1000,
+		# 多进程时每个 worker 处理一定请求数后由 uvicorn 重启，限制内存缓慢增长；单进程没有守护进程拉起，不设上限
+		limit_max_requests=10000 if workers and workers > 1 else None,
+		# 生产环境关闭 uvicorn 访问日志（LoggingMiddleware 已逐条记录请求），只输出警告及以上
+		log_level="info" if dev_mode else "warning",
+		access_log=dev_mode,
 	)
\ No newline at end of file